@@ -2,32 +2,60 @@
 Configuration management for Instagram automation
 """
 import os
+import functools
+from typing import Any, Callable, Optional
 from dotenv import load_dotenv
 
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Parse the .env file once per process"""
+    load_dotenv()
+    return True
+
+
+class _EnvSetting:
+    """Class-level setting resolved from the environment on first access"""
+    
+    def __init__(self, key: str, default: str = '', cast: Optional[Callable[[str], Any]] = None):
+        self.key = key
+        self.default = default
+        self.cast = cast
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner) -> Any:
+        value = owner.get(self.key, self.default)
+        if self.cast:
+            value = self.cast(value)
+        # Replace the descriptor with the resolved value so later reads are plain attribute lookups
+        setattr(owner, self.name, value)
+        return value
+
 
 class Config:
     """Application configuration"""
     
     # Instagram credentials
-    INSTAGRAM_USERNAME = os.getenv('INSTAGRAM_USERNAME', '')
-    INSTAGRAM_PASSWORD = os.getenv('INSTAGRAM_PASSWORD', '')
+    INSTAGRAM_USERNAME = _EnvSetting('INSTAGRAM_USERNAME', '')
+    INSTAGRAM_PASSWORD = _EnvSetting('INSTAGRAM_PASSWORD', '')
     
     # Posting schedule
-    POSTING_TIME = os.getenv('POSTING_TIME', '09:00')
+    POSTING_TIME = _EnvSetting('POSTING_TIME', '09:00')
     
     # Content sources
-    NASA_API_KEY = os.getenv('NASA_API_KEY', 'DEMO_KEY')  # Free API key from api.nasa.gov
+    NASA_API_KEY = _EnvSetting('NASA_API_KEY', 'DEMO_KEY')  # Free API key from api.nasa.gov
     SPACE_NEWS_RSS = 'https://www.space.com/feeds/all'
     
     # Reel settings
     REEL_DURATION = 15  # seconds
     REEL_FPS = 30
-    PROFILE_PIC_PATH = os.getenv('PROFILE_PIC_PATH', 'profile_pic.jpg')
+    PROFILE_PIC_PATH = _EnvSetting('PROFILE_PIC_PATH', 'profile_pic.jpg')
     
     # Logo settings
-    LOGO_PATH = os.getenv('LOGO_PATH', 'assets/vu.png')
-    USE_LOGO = os.getenv('USE_LOGO', 'true').lower() == 'true'  # Use logo instead of profile pic
+    LOGO_PATH = _EnvSetting('LOGO_PATH', 'assets/vu.png')
+    USE_LOGO = _EnvSetting('USE_LOGO', 'true', lambda v: v.lower() == 'true')  # Use logo instead of profile pic
     
     # Hashtags
     BASE_HASHTAGS = [
@@ -35,10 +63,22 @@ class Config:
         '#cosmos', '#astrophysics', '#spaceexploration', '#ventureuniverse',
         '#spacenews', '#science', '#galaxy', '#stars', '#spacefacts'
     ]
+    HASHTAG_STRING = " ".join(BASE_HASHTAGS[:10])  # Caption hashtags, joined once
+    
+    @classmethod
+    def get(cls, key: str, default: str = '') -> str:
+        """Get a setting from the environment, loading .env on first use"""
+        _load_env()
+        return os.getenv(key, default)
+    
+    _validated = False
     
     @classmethod
     def validate(cls):
-        """Validate required configuration"""
+        """Validate required configuration (checked once per process)"""
+        if cls._validated:
+            return True
         if not cls.INSTAGRAM_USERNAME or not cls.INSTAGRAM_PASSWORD:
             raise ValueError("Instagram credentials must be set in .env file")
+        cls._validated = True
         return True
@@ -1,64 +1,117 @@
 """
 Optimized content generator for trending space and astronomy topics
 """
+import re
+import html
+import time
+import threading
 import requests
-import feedparser
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from functools import lru_cache
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
+from xml.etree import ElementTree
+from diskcache import Cache
+try:
+    import orjson as _json  # Optional: faster bytes-to-object decoding
+except ImportError:
+    import json as _json
+from config import Config
+from http_client import SESSION
 from utils import retry, logger
 
+# Compiled once; generate_caption runs on every post
+_HTML_RE = re.compile(r'<[^<]+?>')
+
 class ContentGenerator:
     """Generates trending space/astronomy content for reels with caching"""
     
-    def __init__(self, nasa_api_key: str = 'DEMO_KEY', cache_ttl: int = 3600):
+    def __init__(
+        self, 
+        nasa_api_key: str = 'DEMO_KEY', 
+        cache_ttl: int = 3600, 
+        background_refresh: bool = True, 
+        cache_dir: str = '.cache/content'
+    ):
         self.nasa_api_key = nasa_api_key
         self.nasa_apod_url = 'https://api.nasa.gov/planetary/apod'
         self.space_news_rss = 'https://www.space.com/feeds/all'
         self.cache_ttl = cache_ttl  # Cache TTL in seconds
-        self._cache: Dict[str, tuple] = {}  # Simple in-memory cache
-        
-        # Use session for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-    
-    def _get_cached(self, key: str) -> Optional[Any]:
-        """Get cached value if not expired"""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if datetime.now() - timestamp < timedelta(seconds=self.cache_ttl):
-                return value
-            else:
-                del self._cache[key]
-        return None
-    
-    def _set_cache(self, key: str, value: Any):
-        """Set cache value with timestamp"""
-        self._cache[key] = (value, datetime.now())
+        # Disk-backed cache survives restarts; thread- and process-safe
+        self._cache = Cache(cache_dir, size_limit=10 << 20)
+        
+        # Use the process-wide session for connection pooling
+        self.session = SESSION
+        
+        # Keep the cache warm in the background so the posting path rarely waits on the network
+        self._stop_event = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        if background_refresh:
+            self._refresher = threading.Thread(target=self._refresh_loop, name='content-refresher', daemon=True)
+            self._refresher.start()
+    
+    def _conditional_get(self, url: str, validator_key: str, **kwargs) -> Tuple[requests.Response, Optional[Dict[str, Any]]]:
+        """GET with If-None-Match/If-Modified-Since; returns the stored payload on 304"""
+        validators = self._cache.get(validator_key) or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = self.session.get(url, headers=headers, **kwargs)
+        if response.status_code == 304 and 'value' in validators:
+            return response, validators['value']
+        return response, None
+    
+    def _store(self, cache_key: str, validator_key: str, value: Dict[str, Any], response: requests.Response):
+        """Cache a fresh payload and remember its validators for the next conditional GET"""
+        self._cache.set(cache_key, value, expire=self.cache_ttl)
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            # No expiry: validators must outlive the TTL entry to be useful
+            self._cache.set(validator_key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'value': value
+            })
+    
+    @staticmethod
+    def _apod_cache_key() -> str:
+        """Cache key for today's APOD, bucketed by UTC day"""
+        return f"nasa_apod_{int(time.time() // 86400)}"
     
     @retry(max_attempts=3, delay=2.0)
     def get_nasa_apod(self) -> Optional[Dict[str, Any]]:
         """Get NASA's Astronomy Picture of the Day with caching"""
-        cache_key = f"nasa_apod_{datetime.now().strftime('%Y-%m-%d')}"
+        cache_key = self._apod_cache_key()
         
         # Check cache first
-        cached = self._get_cached(cache_key)
+        cached = self._cache.get(cache_key)
         if cached:
             logger.debug("Returning cached NASA APOD")
             return cached
         
+        return self._fetch_nasa_apod(cache_key)
+    
+    def _fetch_nasa_apod(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch APOD from the API and store it in the cache"""
         try:
             params = {'api_key': self.nasa_api_key}
-            response = self.session.get(
+            response, unchanged = self._conditional_get(
                 self.nasa_apod_url, 
+                'nasa_apod:validators',
                 params=params, 
                 timeout=10
             )
+            if unchanged is not None:
+                self._cache.set(cache_key, unchanged, expire=self.cache_ttl)
+                logger.debug("NASA APOD not modified, reusing cached payload")
+                return unchanged
             response.raise_for_status()
-            data = response.json()
+            data = _json.loads(response.content)
             
             result = {
                 'title': data.get('title', 'Space Discovery'),
@@ -68,8 +121,8 @@ class ContentGenerator:
             }
             
             # Cache the result
-            self._set_cache(cache_key, result)
-            logger.info(f"Fetched NASA APOD: {result['title']}")
+            self._store(cache_key, 'nasa_apod:validators', result, response)
+            logger.info("Fetched NASA APOD: %s", result['title'])
             return result
             
         except requests.exceptions.RequestException as e:
@@ -85,48 +138,101 @@ class ContentGenerator:
         cache_key = "space_news"
         
         # Check cache (shorter TTL for news)
-        cached = self._get_cached(cache_key)
+        cached = self._cache.get(cache_key)
         if cached:
             logger.debug("Returning cached space news")
             return cached
         
+        return self._fetch_space_news(cache_key)
+    
+    def _fetch_space_news(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch the newest space news item and store it in the cache"""
         try:
-            feed = feedparser.parse(self.space_news_rss)
-            if feed.entries:
-                # Get the most recent article (not random for consistency)
-                article = feed.entries[0]
-                result = {
-                    'title': article.get('title', 'Space News'),
-                    'summary': article.get('summary', ''),
-                    'link': article.get('link', '')
-                }
-                
-                # Cache for shorter time (news changes frequently)
-                self._set_cache(cache_key, result)
-                logger.info(f"Fetched space news: {result['title'][:50]}...")
-                return result
-            else:
-                logger.warning("No entries found in space news feed")
-                return None
+            response, unchanged = self._conditional_get(
+                self.space_news_rss, 
+                'space_news:validators', 
+                timeout=10, 
+                stream=True
+            )
+            if unchanged is not None:
+                response.close()
+                self._cache.set(cache_key, unchanged, expire=self.cache_ttl)
+                logger.debug("Space news feed not modified, reusing cached payload")
+                return unchanged
+            response.raise_for_status()
+            response.raw.decode_content = True  # Let urllib3 handle gzip while streaming
+            
+            with response:
+                # Stream the feed and stop at the first (most recent) <item>.
+                # expat is strict: unlike feedparser, malformed feeds are not tolerated.
+                try:
+                    for _, element in ElementTree.iterparse(response.raw, events=('end',)):
+                        if element.tag != 'item':
+                            continue
+                        # Descriptions often carry HTML entities (e.g. &#8217;) inside CDATA
+                        result = {
+                            'title': html.unescape(element.findtext('title') or '') or 'Space News',
+                            'summary': html.unescape(element.findtext('description') or ''),
+                            'link': element.findtext('link') or ''
+                        }
+                        element.clear()
+                        
+                        # Cache for shorter time (news changes frequently)
+                        self._store(cache_key, 'space_news:validators', result, response)
+                        logger.info("Fetched space news: %.50s...", result['title'])
+                        return result
+                except ElementTree.ParseError as e:
+                    logger.warning("Malformed space news feed %s: %s", self.space_news_rss, e)
+                    return None
+            
+            logger.warning("No entries found in space news feed")
+            return None
                 
         except Exception as e:
             logger.error(f"Error fetching space news: {e}")
             return None
     
+    def _refresh_loop(self):
+        """Re-pull sources every cache_ttl/2 so entries are replaced before they expire"""
+        while not self._stop_event.wait(self.cache_ttl / 2):
+            self._fetch_space_news("space_news")
+            
+            # APOD only changes once a day; refetch when today's entry is missing or expired
+            apod_key = self._apod_cache_key()
+            if apod_key not in self._cache:
+                self._fetch_nasa_apod(apod_key)
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background refresher"""
+        self._stop_event.set()
+        if self._refresher and self._refresher.is_alive():
+            self._refresher.join(timeout)
+    
+    def _fetch_sources(self) -> Tuple[Future, Future]:
+        """Start APOD and space news fetches concurrently"""
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            return (
+                executor.submit(self.get_nasa_apod),
+                executor.submit(self.get_trending_space_news)
+            )
+        finally:
+            # Don't block on the fallback source; it finishes in the background and warms the cache
+            executor.shutdown(wait=False)
+    
     def generate_caption(self, content_type: str = 'apod') -> Dict[str, Any]:
         """Generate Instagram caption with hashtags"""
-        from config import Config
-        
         # Try to get content based on type
+        apod_future, news_future = self._fetch_sources()
         if content_type == 'apod':
-            content = self.get_nasa_apod()
+            content = apod_future.result()
             if not content:
-                content = self.get_trending_space_news()
+                content = news_future.result()
                 content_type = 'news'
         else:
-            content = self.get_trending_space_news()
+            content = news_future.result()
             if not content:
-                content = self.get_nasa_apod()
+                content = apod_future.result()
                 content_type = 'apod'
         
         # Fallback content if all sources fail
@@ -140,27 +246,30 @@ class ContentGenerator:
         
         # Generate caption with proper formatting
         explanation = content.get('explanation', content.get('summary', ''))
+        max_caption_length = 2000  # Leave room for hashtags
+        
+        # Bound the regex work below; 2x leaves room for stripped tags
+        if len(explanation) > 2 * max_caption_length:
+            explanation = explanation[:2 * max_caption_length]
+            # Drop a tag cut in half by the slice so it isn't left unstripped
+            open_tag = explanation.rfind('<')
+            if open_tag > explanation.rfind('>'):
+                explanation = explanation[:open_tag]
+        
         # Clean HTML tags if present
         if '<' in explanation:
-            import re
-            explanation = re.sub('<[^<]+?>', '', explanation)
+            explanation = _HTML_RE.sub('', explanation)
         
         # Truncate to fit Instagram limits (2200 chars)
-        max_caption_length = 2000  # Leave room for hashtags
         if len(explanation) > max_caption_length:
             explanation = explanation[:max_caption_length].rsplit(' ', 1)[0] + "..."
         
-        caption_parts = [
-            f"🚀 {content.get('title', 'Space Update')}",
-            "",
-            explanation,
-            "",
-            "Follow @ventureuniverse for daily space updates! 🌌✨",
-            "",
-            " ".join(Config.BASE_HASHTAGS[:10])  # Limit hashtags
-        ]
-        
-        caption = "\n".join(caption_parts)
+        caption = (
+            f"🚀 {content.get('title', 'Space Update')}\n\n"
+            f"{explanation}\n\n"
+            f"Follow @ventureuniverse for daily space updates! 🌌✨\n\n"
+            f"{Config.HASHTAG_STRING}"
+        )
         
         return {
             'caption': caption,
@@ -170,26 +279,30 @@ class ContentGenerator:
     
     def get_content_for_reel(self) -> Dict[str, Any]:
         """Get content ready for reel generation"""
+        apod_future, news_future = self._fetch_sources()
+        
         # Try APOD first (usually has better images)
-        apod = self.get_nasa_apod()
+        apod = apod_future.result()
         if apod and apod.get('image_url'):
+            explanation = apod.get('explanation') or ''
             return {
                 'type': 'apod',
                 'title': apod['title'],
                 'text': apod['title'],
                 'image_url': apod['image_url'],
-                'description': apod['explanation'][:150] + "..." if len(apod.get('explanation', '')) > 150 else apod.get('explanation', '')
+                'description': explanation[:150] + "..." if len(explanation) > 150 else explanation
             }
         
         # Fallback to news
-        news = self.get_trending_space_news()
+        news = news_future.result()
         if news:
+            summary = news.get('summary') or ''
             return {
                 'type': 'news',
                 'title': news['title'],
                 'text': news['title'],
                 'image_url': None,
-                'description': news.get('summary', '')[:150] + "..." if len(news.get('summary', '')) > 150 else news.get('summary', '')
+                'description': summary[:150] + "..." if len(summary) > 150 else summary
             }
         
         # Ultimate fallback
@@ -202,7 +315,13 @@ class ContentGenerator:
             'description': 'The cosmos awaits!'
         }
     
-    def __del__(self):
-        """Cleanup session on deletion"""
-        if hasattr(self, 'session'):
-            self.session.close()
+    def close(self):
+        """Stop background refresh and release the cache"""
+        self.stop()
+        self._cache.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,29 @@
+"""
+Shared HTTP session for all outbound requests
+"""
+import shutil
+from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+
+# One connection pool and TLS context for the whole process.
+# Retries are left to the @retry decorator, so the adapter does none.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+})
+
+
+def download_to(url: str, path: str, timeout: float) -> str:
+    """Stream url to path through the shared session; raises on HTTP or I/O errors"""
+    with SESSION.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # Undo any transfer gzip while copying
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 20)
+    return path
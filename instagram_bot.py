@@ -4,22 +4,28 @@ Optimized Instagram automation bot for posting reels
 import os
 import time
 import logging
-from pathlib import Path
 from typing import Optional
 from contextlib import contextmanager
 from instagrapi import Client
 from instagrapi.exceptions import LoginRequired, ChallengeRequired, PleaseWaitFewMinutes
-from utils import retry, logger
+from http_client import download_to
+from utils import retry, logger, get_file_size_mb
 
 class InstagramBot:
     """Instagram bot for automated posting with optimized error handling"""
     
+    # How long a successful session check is trusted before calling account_info() again
+    SESSION_CHECK_INTERVAL = 60  # seconds
+    # Saved sessions younger than this are used without a verification round-trip
+    SESSION_MAX_AGE = 6 * 3600  # seconds
+    
     def __init__(self, username: str, password: str, session_file: str = 'instagram_session.json'):
         self.username = username
         self.password = password
         self.session_file = session_file
         self.client = Client()
         self._is_logged_in = False
+        self._last_verified = 0.0  # time.monotonic() of the last confirmed session
         
         # Configure client settings for better reliability
         self.client.delay_range = [1, 3]  # Random delay between requests
@@ -34,20 +40,33 @@ class InstagramBot:
         # Optionally refresh session periodically
     
     @retry(max_attempts=3, delay=2.0)
-    def login(self) -> bool:
-        """Login to Instagram with session management"""
+    def login(self, verify: bool = False) -> bool:
+        """Login to Instagram with session management
+        
+        Recently saved sessions are trusted without calling the API; pass
+        verify=True to always confirm the saved session first.
+        """
         try:
             # Try to load existing session
             if os.path.exists(self.session_file):
                 try:
+                    session_age = time.time() - os.path.getmtime(self.session_file)
                     self.client.load_settings(self.session_file)
-                    # Verify session is still valid
-                    self.client.account_info()
-                    logger.info("Logged in using saved session")
+                    
+                    if verify or session_age >= self.SESSION_MAX_AGE:
+                        # Verify session is still valid
+                        self.client.account_info()
+                        self._last_verified = time.monotonic()
+                        # Re-save so the refreshed session counts as recent next time
+                        self.client.dump_settings(self.session_file)
+                        logger.info("Logged in using saved session")
+                    else:
+                        # Let the first real API call surface an expired session
+                        logger.info("Logged in using recent saved session (%.1fh old)", session_age / 3600)
                     self._is_logged_in = True
                     return True
                 except Exception as e:
-                    logger.warning(f"Session invalid: {e}. Attempting fresh login...")
+                    logger.warning("Session invalid: %s. Attempting fresh login...", e)
                     # Remove invalid session file
                     try:
                         os.remove(self.session_file)
@@ -62,6 +81,7 @@ class InstagramBot:
             self.client.dump_settings(self.session_file)
             logger.info("Login successful!")
             self._is_logged_in = True
+            self._last_verified = time.monotonic()
             return True
             
         except ChallengeRequired:
@@ -86,16 +106,16 @@ class InstagramBot:
     def post_reel(self, video_path: str, caption: str) -> Optional[object]:
         """Post a reel to Instagram with retry logic"""
         with self._ensure_login():
-            if not os.path.exists(video_path):
+            file_size_mb = get_file_size_mb(video_path)
+            if file_size_mb is None:
                 raise FileNotFoundError(f"Video file not found: {video_path}")
             
             # Validate file size
-            file_size_mb = os.path.getsize(video_path) / (1024 * 1024)
             if file_size_mb > 100:  # Instagram limit is ~100MB
                 raise ValueError(f"Video file too large: {file_size_mb:.2f}MB (max 100MB)")
             
-            logger.info(f"Uploading reel: {video_path} ({file_size_mb:.2f}MB)")
-            logger.debug(f"Caption preview: {caption[:100]}...")
+            logger.info("Uploading reel: %s (%.2fMB)", video_path, file_size_mb)
+            logger.debug("Caption preview: %.100s...", caption)
             
             try:
                 # Upload reel
@@ -104,9 +124,14 @@ class InstagramBot:
                     caption=caption
                 )
                 
-                logger.info(f"Reel posted successfully! Media ID: {media.id}")
+                logger.info("Reel posted successfully! Media ID: %s", media.id)
                 return media
                 
+            except LoginRequired as e:
+                # Saved session was trusted without verification; force a fresh login on retry
+                logger.warning("Session rejected while posting: %s", e)
+                self._drop_session()
+                raise
             except PleaseWaitFewMinutes as e:
                 logger.error(f"Rate limited: {e}")
                 raise
@@ -131,21 +156,16 @@ class InstagramBot:
                     return None
                 
                 # Download profile picture
-                import requests
-                response = requests.get(profile_pic_url, timeout=10, stream=True)
-                response.raise_for_status()
-                
-                # Save to file
-                save_path_obj = Path(save_path)
-                save_path_obj.parent.mkdir(parents=True, exist_ok=True)
+                download_to(profile_pic_url, save_path, timeout=10)
                 
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                logger.info(f"Profile picture saved to {save_path}")
+                logger.info("Profile picture saved to %s", save_path)
                 return save_path
                 
+            except LoginRequired as e:
+                # Same as post_reel: let @retry run again with a fresh login
+                logger.warning("Session rejected while fetching profile picture: %s", e)
+                self._drop_session()
+                raise
             except Exception as e:
                 logger.error(f"Error getting profile picture: {e}")
                 return None
@@ -155,13 +175,31 @@ class InstagramBot:
         if not self._is_logged_in:
             return False
         
+        # Skip the round-trip if the session was confirmed recently
+        if time.monotonic() - self._last_verified < self.SESSION_CHECK_INTERVAL:
+            return True
+        
         try:
             self.client.account_info()
+            self._last_verified = time.monotonic()
             return True
+        except LoginRequired:
+            # Session is dead; make sure the next login() doesn't trust the saved file again
+            self._drop_session()
+            return False
         except:
             self._is_logged_in = False
             return False
     
+    def _drop_session(self):
+        """Forget the current session and delete its saved file so the next login is fresh"""
+        self._is_logged_in = False
+        self._last_verified = 0.0
+        try:
+            os.remove(self.session_file)
+        except OSError:
+            pass
+    
     def logout(self):
         """Logout and cleanup"""
         try:
@@ -172,3 +210,4 @@ class InstagramBot:
             pass
         finally:
             self._is_logged_in = False
+            self._last_verified = 0.0
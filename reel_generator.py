@@ -2,14 +2,107 @@
 Optimized reel generator - creates video reels from profile picture and content
 """
 import os
+import shutil
+import functools
+import hashlib
 import subprocess
+import tempfile
 import logging
 from pathlib import Path
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import List, Optional, Tuple
 from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import ImageClip
 from utils import logger, ensure_directory, cleanup_temp_files, validate_video_file
 from config import Config
+from http_client import download_to
+
+
+@functools.lru_cache(maxsize=1)
+def ffmpeg_available() -> bool:
+    """Check once per process whether ffmpeg is available"""
+    if shutil.which('ffmpeg') is None:
+        return False
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-version'], 
+            capture_output=True, 
+            timeout=2
+        )
+        return result.returncode == 0
+    except:
+        return False
+
+
+# Set when a listed hardware encoder fails to encode, so later generators skip it too
+_hw_encoder_failed = False
+
+
+def detect_hw_encoder() -> Optional[str]:
+    """Hardware H.264 encoder to try first, or None once one has failed in this process"""
+    if _hw_encoder_failed:
+        return None
+    return _probe_hw_encoder()
+
+
+def _disable_hw_encoder():
+    """Stop offering the hardware encoder for the rest of the process"""
+    global _hw_encoder_failed
+    _hw_encoder_failed = True
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_hw_encoder() -> Optional[str]:
+    """Find a hardware H.264 encoder supported by the local ffmpeg build, once per process"""
+    if not ffmpeg_available():
+        return None
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'], 
+            capture_output=True, 
+            text=True, 
+            timeout=5
+        )
+    except Exception:
+        return None
+    
+    # h264_vaapi is left out: it needs a -vaapi_device and hwupload filter setup
+    for encoder in ('h264_videotoolbox', 'h264_nvenc'):
+        if encoder in result.stdout:
+            logger.info(f"Using hardware encoder: {encoder}")
+            return encoder
+    return None
+
+
+FONT_PATHS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "arial.ttf"
+]
+
+
+@functools.lru_cache(maxsize=16)
+def _get_font(size: int) -> ImageFont.FreeTypeFont:
+    """Load the first available font at this size, shared by all generators"""
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except:
+            continue
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=256)
+def _render_line(line: str, font: ImageFont.FreeTypeFont) -> Tuple[Image.Image, Tuple[int, int]]:
+    """Rasterize a text line once; returns its coverage mask and offset from the draw origin
+    
+    The mask is colour-independent, so the fill is applied when pasting.
+    Cached images are shared and must not be modified.
+    """
+    left, top, right, bottom = font.getbbox(line)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), line, fill=255, font=font)
+    return mask, (left, top)
+
 
 class ReelGenerator:
     """Generates Instagram reels from profile picture and content with optimizations"""
@@ -18,13 +111,21 @@ class ReelGenerator:
     REEL_WIDTH = 1080
     REEL_HEIGHT = 1920
     
+    # Fixed attribute set: faster lookups and typo-ed assignments fail fast
+    __slots__ = (
+        'profile_pic_path', 'use_logo', 'logo_path', 'output_dir', 'image_path',
+        '_fonts', '_ffmpeg_available', '_hw_encoder',
+        '_logo_bg', '_watermark_rgb', '_watermark_alpha', '_profile_rgb', '_profile_alpha'
+    )
+    
     def __init__(self, profile_pic_path: str, output_dir: str = 'output', use_logo: bool = False, logo_path: Optional[str] = None):
         self.profile_pic_path = profile_pic_path
         self.use_logo = use_logo
         self.logo_path = logo_path or Config.LOGO_PATH
         self.output_dir = ensure_directory(output_dir)
         self._fonts = self._load_fonts()
-        self._ffmpeg_available = self._check_ffmpeg()
+        self._ffmpeg_available = ffmpeg_available()
+        self._hw_encoder = detect_hw_encoder()
         
         # Determine which image to use
         if self.use_logo and os.path.exists(self.logo_path):
@@ -34,63 +135,95 @@ class ReelGenerator:
             self.image_path = self.profile_pic_path
             logger.info(f"Using profile picture: {self.profile_pic_path}")
         
-    def _check_ffmpeg(self) -> bool:
-        """Check if ffmpeg is available"""
+        # Decode and resize the logo once; every frame starts from a copy.
+        # Overlays are kept as RGB tiles plus an 'L' alpha so the frame itself stays RGB.
+        self._logo_bg: Optional[Image.Image] = None
+        self._watermark_rgb: Optional[Image.Image] = None
+        self._watermark_alpha: Optional[Image.Image] = None
+        if self.use_logo and os.path.exists(self.logo_path):
+            self._logo_bg = self._extract_background_from_logo(self.logo_path)
+            self._watermark_rgb, self._watermark_alpha = self._load_logo_watermark(self.logo_path)
+        
+        # Likewise the circular profile picture, when it is shown
+        self._profile_rgb: Optional[Image.Image] = None
+        self._profile_alpha: Optional[Image.Image] = None
+        if not self.use_logo:
+            self._profile_rgb, self._profile_alpha = self._load_profile_tile(self.profile_pic_path)
+        
+    @staticmethod
+    def _mtime(path: str) -> int:
+        """File modification time in ns, or 0 if missing"""
         try:
-            result = subprocess.run(
-                ['ffmpeg', '-version'], 
-                capture_output=True, 
-                timeout=2
-            )
-            return result.returncode == 0
-        except:
-            return False
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+    
+    def _frame_cache_path(self, content_data: dict) -> Path:
+        """Cache location for a frame rendered from these inputs"""
+        key = hashlib.blake2b(digest_size=16)
+        for part in (
+            content_data.get('text', 'Space Update'),
+            content_data.get('image_url') or '',
+            self.use_logo,
+            self.image_path,
+            self._mtime(self.image_path),
+        ):
+            key.update(str(part).encode('utf-8'))
+            key.update(b'\0')
+        return self.output_dir / '.cache' / f'{key.hexdigest()}.png'
+    
+    def _load_cached_frame(self, cached_frame_path: Path) -> Optional[Image.Image]:
+        """Load a previously rendered frame, dropping the entry if it can't be decoded"""
+        try:
+            with Image.open(cached_frame_path) as cached_frame:
+                frame = cached_frame.convert('RGB')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached frame {cached_frame_path.name}: {e}")
+            cached_frame_path.unlink(missing_ok=True)
+            return None
+        
+        # Same text, image and branding as a previous run; skip download and rendering
+        logger.info(f"Reusing cached reel frame: {cached_frame_path.name}")
+        return frame
+    
+    def _save_cached_frame(self, frame: Image.Image, cached_frame_path: Path):
+        """Write a frame to the cache atomically so an interrupted save never leaves a partial entry"""
+        cache_dir = ensure_directory(str(cached_frame_path.parent))
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # Lossless, so a cache hit encodes exactly the frame a fresh render would;
+                # level 1 keeps the DEFLATE pass cheap on the large flat background
+                frame.save(f, 'PNG', compress_level=1)
+            os.replace(tmp_path, cached_frame_path)
+        except Exception as e:
+            # The cache is only an optimisation; the reel can still be made from this frame
+            logger.warning(f"Could not cache reel frame: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        cleanup_temp_files(str(cache_dir), "*.png", keep_recent=10)
+    
+    @staticmethod
+    def _encoder_args(encoder: Optional[str]) -> list:
+        """ffmpeg video codec arguments for a hardware encoder, or libx264 when None"""
+        if encoder:
+            return ['-c:v', encoder]
+        # Every frame is the same still image, so the fastest preset costs no quality
+        return ['-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'stillimage']
     
     def _load_fonts(self) -> dict:
         """Load fonts with fallbacks"""
-        fonts = {}
-        font_paths = [
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/System/Library/Fonts/Supplemental/Arial.ttf",
-            "arial.ttf"
-        ]
-        
-        # Try to load large font
-        for path in font_paths:
-            try:
-                fonts['large'] = ImageFont.truetype(path, 60)
-                break
-            except:
-                continue
-        else:
-            fonts['large'] = ImageFont.load_default()
-        
-        # Try to load medium font
-        for path in font_paths:
-            try:
-                fonts['medium'] = ImageFont.truetype(path, 40)
-                break
-            except:
-                continue
-        else:
-            fonts['medium'] = ImageFont.load_default()
-        
-        return fonts
+        return {
+            'large': _get_font(60),
+            'medium': _get_font(40)
+        }
     
     def download_image(self, url: str, save_path: str) -> bool:
         """Download image from URL with streaming"""
         try:
-            import requests
-            response = requests.get(url, timeout=15, stream=True)
-            response.raise_for_status()
-            
-            save_path_obj = Path(save_path)
-            save_path_obj.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
+            download_to(url, save_path, timeout=15)
             logger.debug(f"Downloaded image: {save_path}")
             return True
         except Exception as e:
@@ -104,36 +237,56 @@ class ReelGenerator:
         draw.ellipse((0, 0, size, size), fill=255)
         return mask
     
-    def _wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list:
-        """Wrap text to fit within max_width efficiently"""
+    def _wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[Tuple[str, int]]:
+        """Wrap text to fit within max_width, measuring each word only once
+        
+        Returns (line, width) pairs so callers can position lines without re-measuring.
+        """
         words = text.split()
         if not words:
             return []
         
+        space_width = font.getlength(' ')
         lines = []
         current_line = []
-        
-        # Create a temporary image for text measurement (reuse)
-        temp_img = Image.new('RGB', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
+        current_width = 0.0
         
         for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            test_width = bbox[2] - bbox[0]
+            word_width = font.getlength(word)
+            test_width = current_width + space_width + word_width if current_line else word_width
             
             if test_width <= max_width:
                 current_line.append(word)
+                current_width = test_width
             else:
                 if current_line:
-                    lines.append(' '.join(current_line))
+                    lines.append((' '.join(current_line), round(current_width)))
                 current_line = [word]
+                current_width = word_width
         
         if current_line:
-            lines.append(' '.join(current_line))
+            lines.append((' '.join(current_line), round(current_width)))
         
         return lines
     
+    def _load_profile_tile(self, profile_pic_path: str) -> Tuple[Optional[Image.Image], Optional[Image.Image]]:
+        """Load the profile picture as a 400x400 RGB tile and its circular 'L' mask"""
+        try:
+            image = Image.open(profile_pic_path)
+            image_size = 400
+            # Let libjpeg decode at a reduced scale (no-op for other formats)
+            image.draft('RGB', (2 * image_size, 2 * image_size))
+            image = image.convert('RGBA' if image.mode == 'RGBA' else 'RGB')
+            
+            # Resize image; BICUBIC is enough here since the circular mask hides
+            # the fine detail where LANCZOS would differ
+            image = image.resize((image_size, image_size), Image.Resampling.BICUBIC, reducing_gap=2.0)
+            
+            return image.convert('RGB'), self._create_circular_mask(image_size)
+        except Exception as e:
+            logger.warning(f"Error loading profile picture: {e}")
+            return None, None
+    
     def _extract_background_from_logo(self, logo_path: str) -> Image.Image:
         """Extract and resize the cosmic background from the logo"""
         try:
@@ -142,7 +295,7 @@ class ReelGenerator:
             
             # Resize logo background to fit reel dimensions (1080x1920)
             # Use high-quality resampling to maintain the cosmic effect
-            background = logo.resize((self.REEL_WIDTH, self.REEL_HEIGHT), Image.Resampling.LANCZOS)
+            background = logo.resize((self.REEL_WIDTH, self.REEL_HEIGHT), Image.Resampling.LANCZOS, reducing_gap=2.0)
             logo.close()
             
             logger.debug(f"Extracted background from logo: {logo_path}")
@@ -152,6 +305,23 @@ class ReelGenerator:
             # Fallback to dark space background
             return Image.new('RGB', (self.REEL_WIDTH, self.REEL_HEIGHT), color='#0a0a1a')
     
+    def _load_logo_watermark(self, logo_path: str) -> Tuple[Optional[Image.Image], Optional[Image.Image]]:
+        """Load the small top-right logo watermark as an RGB tile and optional 'L' alpha"""
+        # This is optional - return None here if you don't want the logo character on top
+        try:
+            logo_img = Image.open(logo_path)
+            logo_img = logo_img.convert('RGBA' if logo_img.mode == 'RGBA' else 'RGB')
+            
+            # Make logo smaller as a watermark (optional)
+            watermark_size = 150
+            logo_img.thumbnail((watermark_size, watermark_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            
+            alpha = logo_img.getchannel('A') if logo_img.mode == 'RGBA' else None
+            return logo_img.convert('RGB'), alpha
+        except Exception as e:
+            logger.debug(f"Optional logo watermark not added: {e}")
+            return None, None
+    
     def create_reel_frame(
         self, 
         profile_pic_path: str, 
@@ -159,145 +329,121 @@ class ReelGenerator:
         content_image_path: Optional[str] = None
     ) -> Image.Image:
         """Create a single frame for the reel"""
+        frame = self._compose_base(profile_pic_path, content_text)
+        if content_image_path:
+            self._overlay_content_image(frame, content_image_path)
+        return frame
+    
+    def _compose_base(self, profile_pic_path: str, content_text: str) -> Image.Image:
+        """Compose background, branding and text; everything except the content image"""
         # Use logo background if logo is enabled, otherwise use black background
-        if self.use_logo and os.path.exists(self.logo_path):
-            frame = self._extract_background_from_logo(self.logo_path)
+        if self._logo_bg is not None:
+            frame = self._logo_bg.copy()
         else:
             # Create base frame with dark background
             frame = Image.new('RGB', (self.REEL_WIDTH, self.REEL_HEIGHT), color='#000000')
         
-        draw = ImageDraw.Draw(frame)
-        
         # Load and add profile picture or logo
         # When using logo background, we can optionally show a smaller logo watermark
         # or skip it since the background already has the cosmic theme
         if not self.use_logo:
             # Only show profile picture if not using logo background
-            try:
-                image = Image.open(profile_pic_path)
-                image = image.convert('RGBA' if image.mode == 'RGBA' else 'RGB')
-                image_size = 400
-                
-                # Resize image
-                image = image.resize((image_size, image_size), Image.Resampling.LANCZOS)
-                
-                # Create and apply circular mask for profile pic
-                mask = self._create_circular_mask(image_size)
-                
-                # Paste image at top center
-                image_x = (self.REEL_WIDTH - image.width) // 2
+            if profile_pic_path == self.profile_pic_path:
+                profile, mask = self._profile_rgb, self._profile_alpha
+            else:
+                profile, mask = self._load_profile_tile(profile_pic_path)
+            
+            if profile is not None:
+                # Paste image at top center through the circular mask
+                image_x = (self.REEL_WIDTH - profile.width) // 2
                 image_y = 200
-                frame.paste(image, (image_x, image_y), mask)
-                
-                # Clean up
-                image.close()
-                
-            except Exception as e:
-                logger.warning(f"Error loading profile picture: {e}")
+                frame.paste(profile, (image_x, image_y), mask)
         else:
             # When using logo background, optionally add a small logo watermark at top
-            # This is optional - comment out if you don't want the logo character on top
-            try:
-                logo_img = Image.open(self.logo_path)
-                logo_img = logo_img.convert('RGBA' if logo_img.mode == 'RGBA' else 'RGB')
-                
-                # Make logo smaller as a watermark (optional)
-                watermark_size = 150
-                logo_img.thumbnail((watermark_size, watermark_size), Image.Resampling.LANCZOS)
-                
+            logo_img = self._watermark_rgb
+            if logo_img is not None:
                 # Position at top right corner as watermark
                 logo_x = self.REEL_WIDTH - logo_img.width - 30
                 logo_y = 30
-                
-                if logo_img.mode == 'RGBA':
-                    frame.paste(logo_img, (logo_x, logo_y), logo_img)
-                else:
-                    frame.paste(logo_img, (logo_x, logo_y))
-                
-                logo_img.close()
-            except Exception as e:
-                logger.debug(f"Optional logo watermark not added: {e}")
-        
-        # Add content image if available
-        if content_image_path and os.path.exists(content_image_path):
-            try:
-                content_img = Image.open(content_image_path)
-                content_img = content_img.convert('RGB')
-                
-                # Resize to fit in middle section while maintaining aspect ratio
-                max_size = 600
-                content_img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
-                
-                img_x = (self.REEL_WIDTH - content_img.width) // 2
-                img_y = 700
-                frame.paste(content_img, (img_x, img_y))
-                
-                # Clean up
-                content_img.close()
-                
-            except Exception as e:
-                logger.warning(f"Error loading content image: {e}")
+                frame.paste(logo_img, (logo_x, logo_y), self._watermark_alpha)
         
         # Add text overlay
         text_y = 1300
         text_lines = self._wrap_text(content_text, self._fonts['medium'], self.REEL_WIDTH - 100)
         
-        for i, line in enumerate(text_lines[:3]):  # Max 3 lines
-            bbox = draw.textbbox((0, 0), line, font=self._fonts['medium'])
-            text_width = bbox[2] - bbox[0]
+        for i, (line, text_width) in enumerate(text_lines[:3]):  # Max 3 lines
+            line_mask, (offset_x, offset_y) = _render_line(line, self._fonts['medium'])
             text_x = (self.REEL_WIDTH - text_width) // 2
-            draw.text((text_x, text_y + i * 50), line, fill='white', font=self._fonts['medium'])
+            frame.paste('white', (text_x + offset_x, text_y + i * 50 + offset_y), line_mask)
         
         return frame
     
-    def _generate_video_moviepy(self, frame_path: str, output_path: str, duration: int) -> bool:
-        """Generate video using moviepy"""
+    def _overlay_content_image(self, frame: Image.Image, content_image_path: str):
+        """Paste the content image into the middle section of the frame"""
+        if not os.path.exists(content_image_path):
+            return
+        
         try:
-            clip = ImageClip(frame_path, duration=duration)
-            clip.write_videofile(
-                output_path,
-                fps=Config.REEL_FPS,
-                codec='libx264',
-                audio=False,
-                preset='medium',
-                logger=None,
-                verbose=False
-            )
-            clip.close()
-            return True
+            content_img = Image.open(content_image_path)
+            max_size = 600
+            # Decode JPEGs at a reduced scale; convert() would otherwise load full resolution
+            content_img.draft('RGB', (2 * max_size, 2 * max_size))
+            content_img = content_img.convert('RGB')
+            
+            # Resize to fit in middle section while maintaining aspect ratio
+            content_img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            
+            img_x = (self.REEL_WIDTH - content_img.width) // 2
+            img_y = 700
+            frame.paste(content_img, (img_x, img_y))
+            
+            # Clean up
+            content_img.close()
+            
         except Exception as e:
-            logger.warning(f"MoviePy video generation failed: {e}")
-            return False
+            logger.warning(f"Error loading content image: {e}")
     
-    def _generate_video_ffmpeg(self, frame_path: str, output_path: str, duration: int) -> bool:
-        """Generate video using ffmpeg directly (more efficient)"""
-        if not self._ffmpeg_available:
-            return False
+    def _generate_video_ffmpeg(self, frame: Image.Image, output_path: str, duration: int) -> bool:
+        """Generate video using ffmpeg, piping the raw frame in over stdin"""
+        if frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+        frame_bytes = frame.tobytes()
         
+        # Try the hardware encoder first, then fall back to software x264
+        encoders = [self._hw_encoder, None] if self._hw_encoder else [None]
         try:
-            cmd = [
-                'ffmpeg', '-y',  # Overwrite output file
-                '-loop', '1',  # Loop the image
-                '-i', frame_path,  # Input image
-                '-t', str(duration),  # Duration
-                '-vf', f'scale={self.REEL_WIDTH}:{self.REEL_HEIGHT}:force_original_aspect_ratio=decrease,pad={self.REEL_WIDTH}:{self.REEL_HEIGHT}:(ow-iw)/2:(oh-ih)/2',
-                '-pix_fmt', 'yuv420p',  # Pixel format for compatibility
-                '-r', str(Config.REEL_FPS),  # Frame rate
-                '-preset', 'medium',  # Encoding preset
-                output_path
-            ]
-            
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=60
-            )
-            
-            if result.returncode == 0:
-                return True
-            else:
-                logger.error(f"ffmpeg error: {result.stderr}")
+            for encoder in encoders:
+                cmd = [
+                    'ffmpeg', '-y',  # Overwrite output file
+                    '-f', 'rawvideo',  # Raw frame on stdin; no intermediate image file
+                    '-pix_fmt', 'rgb24',
+                    '-video_size', f'{frame.width}x{frame.height}',
+                    '-framerate', '1',  # Filter the still once per second...
+                    '-i', '-',
+                    '-t', str(duration),  # Duration
+                    '-vf', f'tpad=stop_mode=clone:stop_duration={duration},scale={self.REEL_WIDTH}:{self.REEL_HEIGHT}:force_original_aspect_ratio=decrease,pad={self.REEL_WIDTH}:{self.REEL_HEIGHT}:(ow-iw)/2:(oh-ih)/2',
+                    '-pix_fmt', 'yuv420p',  # Pixel format for compatibility
+                    '-r', str(Config.REEL_FPS),  # ...and duplicate up to the output frame rate
+                    *self._encoder_args(encoder),
+                    output_path
+                ]
+                
+                result = subprocess.run(
+                    cmd, 
+                    input=frame_bytes, 
+                    capture_output=True, 
+                    timeout=60
+                )
+                
+                if result.returncode == 0:
+                    return True
+                if encoder:
+                    # Listed encoders can still be unusable (e.g. no GPU); don't try it again
+                    logger.warning(f"Hardware encoder {encoder} failed, falling back to libx264")
+                    self._hw_encoder = None
+                    _disable_hw_encoder()
+                    continue
+                logger.error(f"ffmpeg error: {result.stderr.decode(errors='replace')}")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -309,47 +455,62 @@ class ReelGenerator:
     
     def generate_reel(self, content_data: dict, duration: int = 15) -> str:
         """Generate a video reel with optimized methods"""
-        # Download content image if available
-        content_image_path = None
-        if content_data.get('image_url'):
-            content_image_path = self.output_dir / 'content_image.jpg'
-            if not self.download_image(content_data['image_url'], str(content_image_path)):
-                content_image_path = None
+        if not self._ffmpeg_available:
+            raise RuntimeError("ffmpeg is required to generate reels; install it and make sure it is on PATH")
         
-        # Create frame (use logo or profile pic based on config)
-        image_path = self.image_path if hasattr(self, 'image_path') else self.profile_pic_path
-        frame = self.create_reel_frame(
-            image_path,
-            content_data.get('text', 'Space Update'),
-            str(content_image_path) if content_image_path else None
-        )
+        cached_frame_path = self._frame_cache_path(content_data)
         
-        # Save frame
-        frame_path = self.output_dir / 'reel_frame.jpg'
-        frame.save(frame_path, quality=95, optimize=True)
-        frame.close()  # Free memory
+        frame = self._load_cached_frame(cached_frame_path)
+        if frame is None:
+            image_url = content_data.get('image_url')
+            
+            # Download content image if available, in the background while the frame is composed.
+            # Each call gets its own file so a download abandoned on timeout never shares a path.
+            download = None
+            if image_url:
+                ensure_directory(str(self.output_dir))
+                fd, content_image_path = tempfile.mkstemp(dir=self.output_dir, prefix='content_image_', suffix='.jpg')
+                os.close(fd)
+                executor = ThreadPoolExecutor(max_workers=1)
+                download = executor.submit(self.download_image, image_url, content_image_path)
+                executor.shutdown(wait=False)
+            
+            # Create frame (use logo or profile pic based on config)
+            frame = self._compose_base(self.image_path, content_data.get('text', 'Space Update'))
+            
+            downloaded = False
+            if download is not None:
+                try:
+                    downloaded = download.result(timeout=20)
+                except FuturesTimeoutError:
+                    logger.warning(f"Timed out downloading image from {image_url}; leaving it to finish in the background")
+                    # Remove the file once the abandoned download is done writing it
+                    download.add_done_callback(lambda _, path=content_image_path: Path(path).unlink(missing_ok=True))
+                else:
+                    if downloaded:
+                        self._overlay_content_image(frame, content_image_path)
+                    Path(content_image_path).unlink(missing_ok=True)
+            
+            # Only cache frames whose content image made it in, so a failed download is retried
+            if downloaded or not image_url:
+                self._save_cached_frame(frame, cached_frame_path)
         
         # Create video from frame
         output_path = self.output_dir / 'reel.mp4'
         
-        # Try ffmpeg first (faster and more efficient)
-        if self._ffmpeg_available:
-            logger.info("Generating video using ffmpeg...")
-            if self._generate_video_ffmpeg(str(frame_path), str(output_path), duration):
-                logger.info(f"Video created successfully: {output_path}")
-                # Cleanup temp files
-                cleanup_temp_files(str(self.output_dir), "*.jpg", keep_recent=2)
-                return str(output_path)
+        logger.info("Generating video using ffmpeg...")
+        try:
+            success = self._generate_video_ffmpeg(frame, str(output_path), duration)
+        finally:
+            frame.close()  # Free memory
         
-        # Fallback to moviepy
-        logger.info("Generating video using moviepy...")
-        if self._generate_video_moviepy(str(frame_path), str(output_path), duration):
+        if success:
             logger.info(f"Video created successfully: {output_path}")
+            # Cleanup temp files
             cleanup_temp_files(str(self.output_dir), "*.jpg", keep_recent=2)
             return str(output_path)
         
-        # If both fail, raise exception
-        raise Exception("Could not create video file with any available method")
+        raise Exception("Could not create video file with ffmpeg")
     
     def cleanup(self):
         """Cleanup temporary files"""
@@ -24,17 +24,36 @@ class ReelScheduler:
         self.profile_pic_path = Path(Config.PROFILE_PIC_PATH)
         
     def _initialize_components(self):
-        """Initialize all components"""
+        """Initialize all components, rebuilding only the ones that are missing"""
         try:
-            # Validate config
-            Config.validate()
+            # _ensure_bot validates config before using the credentials
+            self._ensure_bot()
+            self._ensure_content_gen()
+            self._ensure_reel_gen()
             
-            # Initialize bot
-            self.bot = InstagramBot(Config.INSTAGRAM_USERNAME, Config.INSTAGRAM_PASSWORD)
+            logger.info("All components initialized successfully")
+            return True
             
-            # Initialize content generator
+        except Exception as e:
+            logger.error(f"Failed to initialize components: {e}")
+            return False
+    
+    def _ensure_bot(self) -> InstagramBot:
+        """Create the Instagram bot if it doesn't exist yet"""
+        if self.bot is None:
+            Config.validate()
+            self.bot = InstagramBot(Config.INSTAGRAM_USERNAME, Config.INSTAGRAM_PASSWORD)
+        return self.bot
+    
+    def _ensure_content_gen(self) -> ContentGenerator:
+        """Create the content generator if it doesn't exist yet"""
+        if self.content_gen is None:
             self.content_gen = ContentGenerator(Config.NASA_API_KEY)
-            
+        return self.content_gen
+    
+    def _ensure_reel_gen(self) -> ReelGenerator:
+        """Create the reel generator if it doesn't exist yet"""
+        if self.reel_gen is None:
             # Ensure profile picture exists
             self._ensure_profile_picture()
             
@@ -45,13 +64,7 @@ class ReelScheduler:
                 use_logo=Config.USE_LOGO,
                 logo_path=Config.LOGO_PATH if Config.USE_LOGO else None
             )
-            
-            logger.info("All components initialized successfully")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize components: {e}")
-            return False
+        return self.reel_gen
     
     def _ensure_profile_picture(self):
         """Ensure profile picture or logo exists"""
@@ -66,10 +79,11 @@ class ReelScheduler:
         if not self.profile_pic_path.exists():
             logger.info("Profile picture not found. Downloading from Instagram...")
             
-            if not self.bot.login():
+            bot = self._ensure_bot()
+            if not bot.login():
                 raise Exception("Failed to login to download profile picture")
             
-            downloaded = self.bot.get_profile_pic(str(self.profile_pic_path))
+            downloaded = bot.get_profile_pic(str(self.profile_pic_path))
             if not downloaded:
                 logger.warning("Could not get profile picture. Creating placeholder...")
                 from PIL import Image
@@ -81,6 +95,7 @@ class ReelScheduler:
     def post_daily_reel(self):
         """Main function to post daily reel with comprehensive error handling"""
         start_time = datetime.now()
+        start = time.monotonic()  # For elapsed time; immune to wall-clock jumps
         logger.info(f"{'='*60}")
         logger.info(f"Starting daily reel posting at {start_time}")
         logger.info(f"{'='*60}")
@@ -124,7 +139,7 @@ class ReelScheduler:
             media = self.bot.post_reel(reel_path, caption)
             
             if media:
-                elapsed = (datetime.now() - start_time).total_seconds()
+                elapsed = time.monotonic() - start
                 logger.info(f"✅ Daily reel posted successfully!")
                 logger.info(f"   Media ID: {media.id}")
                 logger.info(f"   Reel saved at: {reel_path}")
@@ -138,7 +153,7 @@ class ReelScheduler:
             logger.warning("Posting interrupted by user")
             raise
         except Exception as e:
-            elapsed = (datetime.now() - start_time).total_seconds()
+            elapsed = time.monotonic() - start
             logger.error(f"❌ Error posting daily reel after {elapsed:.2f}s: {e}")
             logger.exception("Full error traceback:")
             return False
@@ -163,11 +178,17 @@ class ReelScheduler:
         try:
             while True:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Sleep until the next job is due (capped so clock changes are picked up hourly)
+                idle = schedule.idle_seconds()
+                if idle is None:
+                    idle = 3600
+                time.sleep(max(1, min(idle, 3600)))
         except KeyboardInterrupt:
             logger.info("\n\nScheduler stopped by user")
             if self.bot:
                 self.bot.logout()
+            if self.content_gen:
+                self.content_gen.close()
             if self.reel_gen:
                 self.reel_gen.cleanup()
 
@@ -3,6 +3,7 @@ Utility functions for Instagram automation
 """
 import logging
 import os
+import fnmatch
 import functools
 import time
 from typing import Optional, Callable, Any
@@ -50,19 +51,22 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
 def cleanup_temp_files(directory: str, pattern: str = "*", keep_recent: int = 5):
     """Clean up temporary files, keeping only the most recent ones"""
     try:
-        dir_path = Path(directory)
-        if not dir_path.exists():
+        try:
+            with os.scandir(directory) as it:
+                entries = [e for e in it if fnmatch.fnmatch(e.name, pattern) and e.is_file()]
+        except FileNotFoundError:
             return
         
-        files = sorted(dir_path.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+        # DirEntry caches its stat result, so each file is stat'ed once
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
         
         # Keep the most recent files
-        for file in files[keep_recent:]:
+        for entry in entries[keep_recent:]:
             try:
-                file.unlink()
-                logger.debug(f"Cleaned up old file: {file}")
+                os.unlink(entry.path)
+                logger.debug(f"Cleaned up old file: {entry.path}")
             except Exception as e:
-                logger.warning(f"Failed to delete {file}: {e}")
+                logger.warning(f"Failed to delete {entry.path}: {e}")
     except Exception as e:
         logger.warning(f"Error during cleanup: {e}")
 
@@ -74,21 +78,20 @@ def ensure_directory(path: str) -> Path:
     return dir_path
 
 
-def get_file_size_mb(file_path: str) -> float:
-    """Get file size in MB"""
+def get_file_size_mb(file_path: str) -> Optional[float]:
+    """Get file size in MB with a single stat, or None if the file doesn't exist"""
     try:
-        size_bytes = os.path.getsize(file_path)
-        return size_bytes / (1024 * 1024)
-    except Exception:
-        return 0.0
+        return os.stat(file_path).st_size / (1024 * 1024)
+    except OSError:
+        return None
 
 
 def validate_video_file(file_path: str, min_size_mb: float = 0.1) -> bool:
     """Validate video file exists and meets minimum size requirement"""
-    if not os.path.exists(file_path):
+    size_mb = get_file_size_mb(file_path)
+    if size_mb is None:
         return False
     
-    size_mb = get_file_size_mb(file_path)
     if size_mb < min_size_mb:
         logger.warning(f"Video file too small: {size_mb:.2f}MB (minimum: {min_size_mb}MB)")
         return False